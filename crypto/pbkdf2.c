@@ -27,14 +27,13 @@
 #include "sha2.h"
 #include "memzero.h"
 
-void pbkdf2_hmac_sha256_Init(PBKDF2_HMAC_SHA256_CTX *pctx, const uint8_t *pass, int passlen, const uint8_t *salt, int saltlen, uint32_t blocknr)
+static void pbkdf2_hmac_sha256_InitBlock(PBKDF2_HMAC_SHA256_CTX *pctx, const uint8_t *salt, int saltlen, uint32_t blocknr)
 {
 	SHA256_CTX ctx;
 #if BYTE_ORDER == LITTLE_ENDIAN
 	REVERSE32(blocknr, blocknr);
 #endif
 
-	hmac_sha256_prepare(pass, passlen, pctx->odig, pctx->idig);
 	memzero(pctx->g, sizeof(pctx->g));
 	pctx->g[8] = 0x80000000;
 	pctx->g[15] = (SHA256_BLOCK_LENGTH + SHA256_DIGEST_LENGTH) * 8;
@@ -54,6 +53,12 @@ void pbkdf2_hmac_sha256_Init(PBKDF2_HMAC_SHA256_CTX *pctx, const uint8_t *pass,
 	pctx->first = 1;
 }
 
+void pbkdf2_hmac_sha256_Init(PBKDF2_HMAC_SHA256_CTX *pctx, const uint8_t *pass, int passlen, const uint8_t *salt, int saltlen, uint32_t blocknr)
+{
+	hmac_sha256_prepare(pass, passlen, pctx->odig, pctx->idig);
+	pbkdf2_hmac_sha256_InitBlock(pctx, salt, saltlen, blocknr);
+}
+
 void pbkdf2_hmac_sha256_Update(PBKDF2_HMAC_SHA256_CTX *pctx, uint32_t iterations)
 {
 	for (uint32_t i = pctx->first; i < iterations; i++) {
@@ -86,9 +91,15 @@ void pbkdf2_hmac_sha256(const uint8_t *pass, int passlen, const uint8_t *salt, i
 	} else {
 		last_block_size = SHA256_DIGEST_LENGTH;
 	}
+	// key pads do not depend on the block number, prepare them once
+	uint32_t odig[SHA256_DIGEST_LENGTH / sizeof(uint32_t)];
+	uint32_t idig[SHA256_DIGEST_LENGTH / sizeof(uint32_t)];
+	hmac_sha256_prepare(pass, passlen, odig, idig);
 	for (uint32_t blocknr = 1; blocknr <= blocks_count; blocknr++) {
 		PBKDF2_HMAC_SHA256_CTX pctx;
-		pbkdf2_hmac_sha256_Init(&pctx, pass, passlen, salt, saltlen, blocknr);
+		memcpy(pctx.odig, odig, sizeof(odig));
+		memcpy(pctx.idig, idig, sizeof(idig));
+		pbkdf2_hmac_sha256_InitBlock(&pctx, salt, saltlen, blocknr);
 		pbkdf2_hmac_sha256_Update(&pctx, iterations);
 		uint8_t digest[SHA256_DIGEST_LENGTH];
 		pbkdf2_hmac_sha256_Final(&pctx, digest);
@@ -99,16 +110,17 @@ void pbkdf2_hmac_sha256(const uint8_t *pass, int passlen, const uint8_t *salt, i
 			memcpy(key + key_offset, digest, last_block_size);
 		}
 	}
+	memzero(odig, sizeof(odig));
+	memzero(idig, sizeof(idig));
 }
 
-void pbkdf2_hmac_sha512_Init(PBKDF2_HMAC_SHA512_CTX *pctx, const uint8_t *pass, int passlen, const uint8_t *salt, int saltlen, uint32_t blocknr)
+static void pbkdf2_hmac_sha512_InitBlock(PBKDF2_HMAC_SHA512_CTX *pctx, const uint8_t *salt, int saltlen, uint32_t blocknr)
 {
 	SHA512_CTX ctx;
 #if BYTE_ORDER == LITTLE_ENDIAN
 	REVERSE32(blocknr, blocknr);
 #endif
 
-	hmac_sha512_prepare(pass, passlen, pctx->odig, pctx->idig);
 	memzero(pctx->g, sizeof(pctx->g));
 	pctx->g[8] = 0x8000000000000000;
 	pctx->g[15] = (SHA512_BLOCK_LENGTH + SHA512_DIGEST_LENGTH) * 8;
@@ -129,6 +141,12 @@ void pbkdf2_hmac_sha512_Init(PBKDF2_HMAC_SHA512_CTX *pctx, const uint8_t *pass,
 	pctx->first = 1;
 }
 
+void pbkdf2_hmac_sha512_Init(PBKDF2_HMAC_SHA512_CTX *pctx, const uint8_t *pass, int passlen, const uint8_t *salt, int saltlen, uint32_t blocknr)
+{
+	hmac_sha512_prepare(pass, passlen, pctx->odig, pctx->idig);
+	pbkdf2_hmac_sha512_InitBlock(pctx, salt, saltlen, blocknr);
+}
+
 void pbkdf2_hmac_sha512_Update(PBKDF2_HMAC_SHA512_CTX *pctx, uint32_t iterations)
 {
 	for (uint32_t i = pctx->first; i < iterations; i++) {
@@ -161,9 +179,15 @@ void pbkdf2_hmac_sha512(const uint8_t *pass, int passlen, const uint8_t *salt, i
 	} else {
 		last_block_size = SHA512_DIGEST_LENGTH;
 	}
+	// key pads do not depend on the block number, prepare them once
+	uint64_t odig[SHA512_DIGEST_LENGTH / sizeof(uint64_t)];
+	uint64_t idig[SHA512_DIGEST_LENGTH / sizeof(uint64_t)];
+	hmac_sha512_prepare(pass, passlen, odig, idig);
 	for (uint32_t blocknr = 1; blocknr <= blocks_count; blocknr++) {
 		PBKDF2_HMAC_SHA512_CTX pctx;
-		pbkdf2_hmac_sha512_Init(&pctx, pass, passlen, salt, saltlen, blocknr);
+		memcpy(pctx.odig, odig, sizeof(odig));
+		memcpy(pctx.idig, idig, sizeof(idig));
+		pbkdf2_hmac_sha512_InitBlock(&pctx, salt, saltlen, blocknr);
 		pbkdf2_hmac_sha512_Update(&pctx, iterations);
 		uint8_t digest[SHA512_DIGEST_LENGTH];
 		pbkdf2_hmac_sha512_Final(&pctx, digest);
@@ -174,4 +198,6 @@ void pbkdf2_hmac_sha512(const uint8_t *pass, int passlen, const uint8_t *salt, i
 			memcpy(key + key_offset, digest, last_block_size);
 		}
 	}
+	memzero(odig, sizeof(odig));
+	memzero(idig, sizeof(idig));
 }
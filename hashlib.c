@@ -7,12 +7,20 @@
 #include "crypto/ripemd160.h"
 #include "crypto/pbkdf2.h"
 #include "crypto/hmac.h"
+#include "crypto/memzero.h"
 
 typedef struct _mp_obj_hash_t {
     mp_obj_base_t base;
     char state[0];
 } mp_obj_hash_t;
 
+// compares hash name buffer with a known name,
+// checks the length so the buffer doesn't have to be NUL-terminated
+STATIC bool hashlib_name_eq(const mp_buffer_info_t *namebuf, const char *name) {
+    size_t len = strlen(name);
+    return namebuf->len == len && memcmp(namebuf->buf, name, len) == 0;
+}
+
 /****************************** SHA1 ******************************/
 
 STATIC mp_obj_t hashlib_sha1_update(mp_obj_t self_in, mp_obj_t arg);
@@ -270,7 +278,7 @@ STATIC mp_obj_t hashlib_pbkdf2_hmac(size_t n_args, const mp_obj_t *args) {
     mp_int_t iter = mp_obj_get_int(args[3]);
 
     // only sha256 or sha512 are supported
-    if(strcmp(typebuf.buf, "sha256") == 0){
+    if(hashlib_name_eq(&typebuf, "sha256")){
         // output length (dklen) if available
         mp_int_t l = SHA256_DIGEST_LENGTH;
         if(n_args > 4){
@@ -281,7 +289,7 @@ STATIC mp_obj_t hashlib_pbkdf2_hmac(size_t n_args, const mp_obj_t *args) {
         pbkdf2_hmac_sha256(pwdbuf.buf, pwdbuf.len, saltbuf.buf, saltbuf.len, iter, (byte*)vstr.buf, l);
         return mp_obj_new_str_from_vstr(&mp_type_bytes, &vstr);
     }
-    if(strcmp(typebuf.buf, "sha512") == 0){
+    if(hashlib_name_eq(&typebuf, "sha512")){
         // output length (dklen) if available
         mp_int_t l = SHA512_DIGEST_LENGTH;
         if(n_args > 4){
@@ -313,19 +321,36 @@ STATIC mp_obj_t hashlib_hmac_sha512(mp_uint_t n_args, const mp_obj_t *args){
 
 STATIC MP_DEFINE_CONST_FUN_OBJ_VAR(hashlib_hmac_sha512_obj, 2, hashlib_hmac_sha512);
 
+/**************************** hash256 ****************************/
+
+// hashlib.hash256(msg) = sha256(sha256(msg))
+STATIC mp_obj_t hashlib_hash256(mp_obj_t msg_in){
+    mp_buffer_info_t msgbuf;
+    mp_get_buffer_raise(msg_in, &msgbuf, MP_BUFFER_READ);
+    uint8_t h[SHA256_DIGEST_LENGTH];
+    sha256_Raw(msgbuf.buf, msgbuf.len, h);
+    vstr_t vstr;
+    vstr_init_len(&vstr, SHA256_DIGEST_LENGTH);
+    sha256_Raw(h, SHA256_DIGEST_LENGTH, (byte*)vstr.buf);
+    memzero(h, sizeof(h));
+    return mp_obj_new_str_from_vstr(&mp_type_bytes, &vstr);
+}
+
+STATIC MP_DEFINE_CONST_FUN_OBJ_1(hashlib_hash256_obj, hashlib_hash256);
+
 STATIC mp_obj_t hashlib_new(size_t n_args, const mp_obj_t *args) {
     mp_buffer_info_t typebuf;
     mp_get_buffer_raise(args[0], &typebuf, MP_BUFFER_READ);
-    if(strcmp(typebuf.buf, "ripemd160") == 0){
+    if(hashlib_name_eq(&typebuf, "ripemd160")){
         return hashlib_ripemd160_make_new(&hashlib_ripemd160_type, n_args-1, 0, args+1);
     }
-    if(strcmp(typebuf.buf, "sha256") == 0){
+    if(hashlib_name_eq(&typebuf, "sha256")){
         return hashlib_sha256_make_new(&hashlib_sha256_type, n_args-1, 0, args+1);
     }
-    if(strcmp(typebuf.buf, "sha512") == 0){
+    if(hashlib_name_eq(&typebuf, "sha512")){
         return hashlib_sha512_make_new(&hashlib_sha512_type, n_args-1, 0, args+1);
     }
-    if(strcmp(typebuf.buf, "sha1") == 0){
+    if(hashlib_name_eq(&typebuf, "sha1")){
         return hashlib_sha1_make_new(&hashlib_sha1_type, n_args-1, 0, args+1);
     }
     mp_raise_ValueError("Unsupported hash type");
@@ -345,6 +370,7 @@ STATIC const mp_rom_map_elem_t hashlib_module_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR_ripemd160), MP_ROM_PTR(&hashlib_ripemd160_type) },
     { MP_ROM_QSTR(MP_QSTR_pbkdf2_hmac), MP_ROM_PTR(&hashlib_pbkdf2_hmac_obj) },
     { MP_ROM_QSTR(MP_QSTR_hmac_sha512), MP_ROM_PTR(&hashlib_hmac_sha512_obj) },
+    { MP_ROM_QSTR(MP_QSTR_hash256), MP_ROM_PTR(&hashlib_hash256_obj) },
 };
 
 STATIC MP_DEFINE_CONST_DICT(hashlib_module_globals, hashlib_module_globals_table);
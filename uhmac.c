@@ -15,6 +15,13 @@ typedef struct _mp_obj_hmac_t {
     char state[0];
 } mp_obj_hmac_t;
 
+// compares digestmod buffer with a known name,
+// checks the length so the buffer doesn't have to be NUL-terminated
+STATIC bool hmac_name_eq(const mp_buffer_info_t *namebuf, const char *name) {
+    size_t len = strlen(name);
+    return namebuf->len == len && memcmp(namebuf->buf, name, len) == 0;
+}
+
 /****************************** HMAC ******************************/
 
 STATIC mp_obj_t hmac_HMAC_update(mp_obj_t self_in, mp_obj_t arg);
@@ -36,16 +43,16 @@ STATIC mp_obj_t hmac_HMAC_make_new_helper(const mp_obj_type_t *type, size_t n_ar
     mp_get_buffer_raise(args[ARG_digestmod].u_obj, &digestmodbuf, MP_BUFFER_READ);
     size_t digestmod = 0;
     // only sha256 or sha512 are supported
-    if(strcmp(digestmodbuf.buf, "sha256") == 0){
+    if(hmac_name_eq(&digestmodbuf, "sha256")){
         digestmod = DIGEST_HMAC_SHA256;
-    }else if(strcmp(digestmodbuf.buf, "sha512") == 0){
+    }else if(hmac_name_eq(&digestmodbuf, "sha512")){
         digestmod = DIGEST_HMAC_SHA512;
     }else{
         mp_raise_ValueError("Unsupported hash type");
         return mp_const_none;
     }
 
-    mp_obj_hmac_t *o = m_new_obj_var(mp_obj_hmac_t, char, digestmod+sizeof(size_t));
+    mp_obj_hmac_t *o = m_new_obj_var(mp_obj_hmac_t, char, digestmod);
     o->digestmod = digestmod;
     o->base.type = type;
 
@@ -72,7 +79,7 @@ STATIC mp_obj_t hmac_HMAC_make_new(const mp_obj_type_t *type, size_t n_args, siz
 
 STATIC mp_obj_t hmac_HMAC_copy(mp_obj_t self_in) {
     mp_obj_hmac_t *self = MP_OBJ_TO_PTR(self_in);
-    mp_obj_hmac_t *o = m_new_obj_var(mp_obj_hmac_t, char, self->digestmod+sizeof(size_t));
+    mp_obj_hmac_t *o = m_new_obj_var(mp_obj_hmac_t, char, self->digestmod);
     o->base.type = self->base.type;
     o->digestmod = self->digestmod;
     memcpy(o->state, self->state, self->digestmod);